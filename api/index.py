@@ -3,28 +3,57 @@ Vercel Serverless API for Security News Collector
 """
 
 from http.server import BaseHTTPRequestHandler
-import json
+from datetime import datetime
+from functools import lru_cache
+import hashlib
 import os
 import sys
+import tempfile
+import threading
+import time
+
+import orjson
 
 # 加入父目錄到路徑
+# news_collector（含 pandas、feedparser）載入成本高，只在需要時於函式內匯入，
+# /api/status 或由快照回應的冷啟動不必負擔
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from news_collector import SecurityNewsCollector, load_demo_data, NewsItem
-from dataclasses import asdict
-import pandas as pd
-
 
 # 全域狀態（注意：Serverless 每次請求可能是新實例）
+# 同一容器在連續請求間會保留記憶體，快取 TTL 內直接回傳上次結果
 collector_cache = {
     'data': None,
-    'last_update': None
+    'collector': None,
+    'news_json_bytes': None,
+    'news_etag': None,
+    'last_update': None,
+    'last_update_ts': 0.0,
+    'ttl': 300
 }
 
+# /tmp 在同一容器內可寫，冷啟動時可先從快照回應
+_SNAPSHOT_PATH = os.path.join(tempfile.gettempdir(), 'security_news.json')
+# 過期快取（含快照）最多沿用的秒數，期間先回舊資料並於背景更新
+_STALE_MAX_AGE = 3600
+_refresh_lock = threading.Lock()
+# 收集器跨請求共用，同時只允許一次收集（前景請求與背景更新可能同時觸發）
+_collect_lock = threading.Lock()
+
 
 def collect_news():
-    """收集新聞"""
-    collector = SecurityNewsCollector()
+    """
+    收集新聞
+    
+    Returns:
+        (collector, is_demo)：is_demo 表示改用展示資料
+    """
+    from news_collector import SecurityNewsCollector, load_demo_data, NewsItem, DATE_FORMAT
+    
+    # 沿用同一個收集器，保留各來源的 ETag / Last-Modified 以發送條件式請求
+    collector = collector_cache['collector']
+    if collector is None:
+        collector = collector_cache['collector'] = SecurityNewsCollector()
     df = collector.collect()
     
     # 如果無法連線，使用展示資料
@@ -34,7 +63,7 @@ def collect_news():
             news_item = NewsItem(
                 title=item['title'],
                 link=item['link'],
-                date=item['date'],
+                date=datetime.strptime(item['date'], DATE_FORMAT),
                 summary=item['summary'],
                 source=item['source'],
                 category=item['category'],
@@ -43,73 +72,256 @@ def collect_news():
             )
             collector.news_items.append(news_item)
         
-        collector.df = pd.DataFrame([asdict(item) for item in collector.news_items])
-        collector.df['keywords_str'] = collector.df['keywords'].apply(
-            lambda x: ', '.join(x) if x else ''
-        )
-        collector.df = collector.df.sort_values('date', ascending=False).reset_index(drop=True)
+        # 展示資料筆數少，直接排序清單，不建立 DataFrame
+        collector.news_items.sort(key=lambda item: item.date, reverse=True)
+        return collector, True
+    
+    return collector, False
+
+
+@lru_cache(maxsize=None)
+def _sources_json():
+    """/api/sources 的回應（預設來源不會變動，首次編碼後重複使用）"""
+    # sources 不依賴第三方套件，不必為了來源清單載入 news_collector
+    from sources import DEFAULT_SOURCES as sources
     
-    return collector
+    return orjson.dumps({
+        'sources': [
+            {'name': name, 'url': url, 'is_default': True}
+            for name, url in sources.items()
+        ],
+        'total': len(sources)
+    })
+
+
+def _dump_json(data, default=None):
+    """
+    編碼 JSON（orjson 直接輸出 UTF-8 bytes，並可處理 numpy 純量）
+    
+    Args:
+        data: 要編碼的資料
+        default: 若提供，datetime 改交由此函式格式化
+    """
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    if default is not None:
+        option |= orjson.OPT_PASSTHROUGH_DATETIME
+    return orjson.dumps(data, default=default, option=option)
+
+
+def _df_to_records(df):
+    """DataFrame 轉為 list of dict（以 itertuples 逐列組裝，避免 to_dict 逐格轉型）"""
+    cols = list(df.columns)
+    return [dict(zip(cols, row)) for row in df.itertuples(index=False, name=None)]
 
 
-def get_news_data():
-    """取得新聞資料"""
-    collector = collect_news()
+def _cache_is_fresh():
+    """快取資料是否仍在 TTL 內"""
+    return (collector_cache['data'] is not None
+            and time.time() - collector_cache['last_update_ts'] < collector_cache['ttl'])
+
+
+def get_news_data(force_refresh=False):
+    """
+    取得新聞資料
     
-    if collector.df is None or collector.df.empty:
-        return {'news': [], 'total_count': 0}
+    Args:
+        force_refresh: 忽略快取，強制重新收集
+    """
+    if not force_refresh and _cache_is_fresh():
+        return collector_cache['data']
     
-    from datetime import datetime
+    # 新聞日期為 datetime，以 news_collector 的格式輸出；收集時已載入該模組
+    from news_collector import json_default
+    
+    with _collect_lock:
+        # 等待鎖期間其他請求（或背景更新）可能已完成收集，不必重複收集
+        if not force_refresh and _cache_is_fresh():
+            return collector_cache['data']
+        
+        collector, is_demo = collect_news()
+        data = _build_news_data(collector, is_demo)
+        
+        body = _dump_json(data, default=json_default)
+        _update_cache(data, body, time.time())
+        _save_snapshot(body)
     
-    return {
-        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'total_count': len(collector.df),
-        'sources': list(collector.df['source'].unique()),
-        'categories': list(collector.df['category'].unique()),
-        'news': collector.df.to_dict(orient='records')
-    }
+    return data
+
+
+def _build_news_data(collector, is_demo):
+    """由收集結果組成 /api/news 的回應資料"""
+    if is_demo:
+        items = collector.news_items
+        data = {
+            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'total_count': len(items),
+            'sources': list(dict.fromkeys(item.source for item in items)),
+            'categories': list(dict.fromkeys(item.category for item in items)),
+            # 直接交給 orjson 序列化 NewsItem dataclass，不經 DataFrame 轉換
+            'news': items
+        }
+    elif collector.df is None or collector.df.empty:
+        data = {'news': [], 'total_count': 0}
+    else:
+        data = {
+            'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'total_count': len(collector.df),
+            'sources': collector.df['source'].unique().tolist(),
+            'categories': collector.df['category'].unique().tolist(),
+            # keywords_str 與 keywords 內容重複，不輸出
+            'news': _df_to_records(collector.df.drop(columns=['keywords_str'], errors='ignore'))
+        }
+    return data
+
+
+def _update_cache(data, body, timestamp):
+    """更新快取中的新聞資料與已編碼回應"""
+    collector_cache['data'] = data
+    collector_cache['news_json_bytes'] = body
+    collector_cache['news_etag'] = '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+    collector_cache['last_update'] = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+    collector_cache['last_update_ts'] = timestamp
+
+
+def _save_snapshot(body):
+    """將新聞回應寫入 /tmp 快照"""
+    tmp_path = _SNAPSHOT_PATH + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, _SNAPSHOT_PATH)
+    except OSError:
+        # 快照僅用於加速冷啟動，寫入失敗不影響回應
+        pass
+
+
+def _load_snapshot():
+    """冷啟動時從 /tmp 快照還原快取"""
+    try:
+        timestamp = os.path.getmtime(_SNAPSHOT_PATH)
+        if time.time() - timestamp >= _STALE_MAX_AGE:
+            return
+        with open(_SNAPSHOT_PATH, 'rb') as f:
+            body = f.read()
+        data = orjson.loads(body)
+    except (OSError, orjson.JSONDecodeError):
+        return
+    _update_cache(data, body, timestamp)
+
+
+def _refresh_in_background():
+    """於背景執行緒重新收集（同時只執行一個）"""
+    if not _refresh_lock.acquire(blocking=False):
+        return
+    
+    def run():
+        try:
+            # 只在快取過期時觸發；若前景請求已先完成收集，這裡直接沿用
+            get_news_data()
+        except Exception as e:
+            print(f"⚠️ 背景更新失敗: {e}")
+        finally:
+            _refresh_lock.release()
+    
+    threading.Thread(target=run, daemon=True).start()
+
+
+_load_snapshot()
+
+
+# JSON 回應固定的標頭
+_JSON_HEADERS = (
+    b'Content-Type: application/json; charset=utf-8\r\n'
+    b'Access-Control-Allow-Origin: *\r\n'
+    b'Access-Control-Allow-Methods: GET, POST, OPTIONS\r\n'
+    b'Access-Control-Allow-Headers: Content-Type\r\n'
+    b'Connection: close\r\n'
+)
+
+
+def _with_trailing_slash(routes):
+    """路由表加入結尾斜線的路徑"""
+    return {**routes, **{path + '/': route for path, route in routes.items()}}
 
 
 class handler(BaseHTTPRequestHandler):
     """Vercel Serverless Handler"""
     
+    # 回應寫入緩衝，讓標頭與內容合併成較少次的 send()
+    wbufsize = 64 * 1024
+    
     def do_GET(self):
         """處理 GET 請求"""
-        path = self.path.split('?')[0]
-        
-        if path == '/api/news' or path == '/api/news/':
-            self._handle_news()
-        elif path == '/api/status' or path == '/api/status/':
-            self._handle_status()
-        elif path == '/api/sources' or path == '/api/sources/':
-            self._handle_sources()
+        route = self._GET_ROUTES.get(self.path.partition('?')[0])
+        if route is None:
+            self._not_found()
         else:
-            self._send_json({'error': 'Not Found', 'path': path}, 404)
+            route(self)
     
     def do_POST(self):
         """處理 POST 請求"""
-        path = self.path.split('?')[0]
-        
-        if path == '/api/collect' or path == '/api/collect/':
-            self._handle_collect()
+        route = self._POST_ROUTES.get(self.path.partition('?')[0])
+        if route is None:
+            self._not_found()
         else:
-            self._send_json({'error': 'Not Found'}, 404)
+            route(self)
+    
+    def _not_found(self):
+        """回應 404"""
+        self._send_json({'error': 'Not Found', 'path': self.path.partition('?')[0]}, 404)
     
     def _send_json(self, data, status=200):
         """發送 JSON 回應"""
-        self.send_response(status)
-        self.send_header('Content-Type', 'application/json; charset=utf-8')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
-        self.wfile.write(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+        self._send_json_bytes(_dump_json(data), status)
+    
+    def _send_json_bytes(self, body, status=200, etag=None):
+        """
+        發送已編碼的 JSON 回應
+        
+        Args:
+            body: JSON bytes，或依序寫出的 bytes 片段串列
+            status: HTTP 狀態碼
+            etag: 若提供則加上 ETag 標頭
+        """
+        chunks = [body] if isinstance(body, bytes) else body
+        
+        # 狀態列與標頭組成一段 bytes 一次寫出，固定標頭使用預先編碼的內容
+        self.log_request(status)
+        head = [
+            ('%s %d %s\r\n' % (self.protocol_version, status, self.responses[status][0])).encode('latin-1'),
+            ('Server: %s\r\nDate: %s\r\n' % (self.version_string(), self.date_time_string())).encode('latin-1'),
+            _JSON_HEADERS,
+            b'Content-Length: %d\r\n' % sum(len(chunk) for chunk in chunks)
+        ]
+        if etag:
+            head.append(b'ETag: ' + etag.encode('ascii') + b'\r\n')
+        head.append(b'\r\n')
+        self.wfile.write(b''.join(head))
+        for chunk in chunks:
+            self.wfile.write(chunk)
     
     def _handle_news(self):
         """處理新聞 API"""
         try:
-            data = get_news_data()
-            self._send_json(data)
+            # 快取內已有編碼好的回應，直接寫出；
+            # 若已過期但仍可沿用（例如冷啟動載入的快照），先回舊資料並於背景更新
+            age = time.time() - collector_cache['last_update_ts']
+            if (collector_cache['news_json_bytes'] is not None
+                    and collector_cache['ttl'] <= age < _STALE_MAX_AGE):
+                _refresh_in_background()
+            else:
+                get_news_data()
+            etag = collector_cache['news_etag']
+            
+            # 資料未變動時回 304，不重送內容
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                return
+            
+            self._send_json_bytes(collector_cache['news_json_bytes'], etag=etag)
         except Exception as e:
             self._send_json({'error': str(e)}, 500)
     
@@ -125,26 +337,20 @@ class handler(BaseHTTPRequestHandler):
     
     def _handle_sources(self):
         """處理來源 API"""
-        sources = SecurityNewsCollector.DEFAULT_SOURCES
-        result = [
-            {'name': name, 'url': url, 'is_default': True}
-            for name, url in sources.items()
-        ]
-        self._send_json({'sources': result, 'total': len(result)})
+        self._send_json_bytes(_sources_json())
     
     def _handle_collect(self):
         """處理收集請求"""
         try:
-            data = get_news_data()
-            from datetime import datetime
-            collector_cache['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            collector_cache['data'] = data
+            data = get_news_data(force_refresh=True)
             
-            self._send_json({
-                'success': True,
-                'message': f"收集完成！共 {data['total_count']} 則新聞",
-                'data': data
-            })
+            # data 沿用快取中已編碼的 bytes，只另外編碼外層欄位
+            message = f"收集完成！共 {data['total_count']} 則新聞"
+            self._send_json_bytes([
+                b'{"success":true,"message":' + orjson.dumps(message) + b',"data":',
+                collector_cache['news_json_bytes'],
+                b'}'
+            ])
         except Exception as e:
             self._send_json({
                 'success': False,
@@ -158,3 +364,13 @@ class handler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         self.end_headers()
+    
+    # 路由表（含結尾斜線版本，查詢時只需去除查詢字串）
+    _GET_ROUTES = _with_trailing_slash({
+        '/api/news': _handle_news,
+        '/api/status': _handle_status,
+        '/api/sources': _handle_sources,
+    })
+    _POST_ROUTES = _with_trailing_slash({
+        '/api/collect': _handle_collect,
+    })
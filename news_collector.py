@@ -5,26 +5,88 @@
 提供分類、搜尋、篩選功能，並可匯出 Excel/CSV/JSON。
 """
 
+import ahocorasick
+import aiohttp
+import asyncio
 import feedparser
-import requests
-from bs4 import BeautifulSoup
-from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Optional
+from lxml import etree
+from lxml import html as lxml_html
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Union
 from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
 import pandas as pd
 import hashlib
 import re
 import json
+import multiprocessing
+import orjson
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import pickle
+import sys
+from functools import lru_cache
 
+from sources import DEFAULT_SOURCES
 
-@dataclass
+try:
+    # feedparser 的內部日期解析器（支援 RFC 822、W3CDTF 等多種格式），非公開 API
+    from feedparser.datetimes import _parse_date as _feedparser_parse_date
+except ImportError:
+    _feedparser_parse_date = None
+
+
+# 預先編譯的正規表示式
+_CVE_RE = re.compile(r'CVE-\d{4}-\d+', re.IGNORECASE)
+_WS_RE = re.compile(r'\s+')
+
+# RSS / Atom 解析用的命名空間
+_ATOM = '{http://www.w3.org/2005/Atom}'
+_CONTENT_ENCODED = '{http://purl.org/rss/1.0/modules/content/}encoded'
+_DC_DATE = '{http://purl.org/dc/elements/1.1/}date'
+
+# 摘要 HTML 以 UTF-8 bytes 解析（字串含 <?xml encoding=...?> 宣告時 lxml 會拒絕解析）
+_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+
+def _parse_feed_date(value: str):
+    """解析 Feed 日期字串為 UTC struct_time（與 feedparser 的 *_parsed 欄位相同），無法解析時回傳 None"""
+    if _feedparser_parse_date is not None:
+        return _feedparser_parse_date(value)
+    
+    # feedparser 內部 API 變動時，退回標準函式庫處理 RFC 822 與 ISO 8601
+    try:
+        return parsedate_to_datetime(value).utctimetuple()
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(value.strip().replace('Z', '+00:00')).utctimetuple()
+    except ValueError:
+        return None
+
+# 日期以 datetime 儲存，僅在輸出時格式化為此字串
+DATE_FORMAT = '%Y-%m-%d %H:%M'
+
+
+def json_default(obj):
+    """orjson 的 default：datetime 以 DATE_FORMAT 輸出（需搭配 OPT_PASSTHROUGH_DATETIME）"""
+    if isinstance(obj, datetime):
+        return obj.strftime(DATE_FORMAT)
+    raise TypeError
+
+
+
+# dataclass(slots=True) 需 Python 3.10+；3.9 維持一般 dataclass
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class NewsItem:
     """新聞項目資料結構"""
     title: str
     link: str
-    date: str
+    date: datetime
     summary: str
     source: str
     category: str = ""
@@ -44,22 +106,8 @@ class SecurityNewsCollector:
     - 匯出 Excel/CSV/JSON
     """
     
-    # 預設新聞來源
-    DEFAULT_SOURCES = {
-        # 台灣來源
-        'iThome 資安': 'https://www.ithome.com.tw/rss/security',
-        'TWCERT/CC': 'https://www.twcert.org.tw/rss',
-        
-        # 國際來源
-        'The Hacker News': 'https://feeds.feedburner.com/TheHackersNews',
-        'Krebs on Security': 'https://krebsonsecurity.com/feed/',
-        'BleepingComputer': 'https://www.bleepingcomputer.com/feed/',
-        'Dark Reading': 'https://www.darkreading.com/rss.xml',
-        'SecurityWeek': 'https://feeds.feedburner.com/securityweek',
-        'Threatpost': 'https://threatpost.com/feed/',
-        'HackRead': 'https://www.hackread.com/feed/',
-        'Sophos News': 'https://news.sophos.com/en-us/feed/',
-    }
+    # 預設新聞來源（定義於 sources.py，API 可不載入本模組直接取用）
+    DEFAULT_SOURCES = DEFAULT_SOURCES
     
     # 分類關鍵字
     CATEGORY_KEYWORDS = {
@@ -92,13 +140,32 @@ class SecurityNewsCollector:
         '漏洞', '駭客', '攻擊', '勒索', '惡意程式', '資安'
     ]
     
-    def __init__(self, custom_sources: Dict[str, str] = None, sources_file: str = None):
+    # 預先轉小寫的關鍵字表，比對時不必逐次 lower()
+    CATEGORY_KEYWORDS_LOWER = {
+        category: [kw.lower() for kw in keywords] for category, keywords in CATEGORY_KEYWORDS.items()
+    }
+    IMPORTANT_KEYWORDS_LOWER = [(kw, kw.lower()) for kw in IMPORTANT_KEYWORDS]
+    
+    def __init_subclass__(cls, **kwargs):
+        """子類別覆寫關鍵字清單時，重建預先轉小寫的關鍵字表"""
+        super().__init_subclass__(**kwargs)
+        cls.CATEGORY_KEYWORDS_LOWER = {
+            category: [kw.lower() for kw in keywords]
+            for category, keywords in cls.CATEGORY_KEYWORDS.items()
+        }
+        cls.IMPORTANT_KEYWORDS_LOWER = [(kw, kw.lower()) for kw in cls.IMPORTANT_KEYWORDS]
+    
+    def __init__(self, custom_sources: Dict[str, str] = None, sources_file: str = None,
+                 parse_workers: int = 0):
         """
         初始化收集器
         
         Args:
             custom_sources: 自訂來源字典 {名稱: RSS URL}
             sources_file: 來源設定 JSON 檔案路徑
+            parse_workers: 解析 Feed 的子行程數（預設 0，在本行程解析）。
+                子行程需重新匯入 pandas 等套件，啟動約需一秒，只在來源多且內容大時值得開啟；
+                子行程會重新載入主程式，呼叫端須以 if __name__ == '__main__' 保護
         """
         self.sources = self.DEFAULT_SOURCES.copy()
         
@@ -112,7 +179,15 @@ class SecurityNewsCollector:
         
         self.news_items: List[NewsItem] = []
         self.df: Optional[pd.DataFrame] = None
-        self.seen_hashes: set = set()
+        # search() 用的小寫合併字串，與建立時的 DataFrame 綁定
+        self._haystack: Optional[pd.Series] = None
+        self._haystack_df: Optional[pd.DataFrame] = None
+        self.seen_hashes: set = set()  # 已見過的 content_hash
+        # 各來源上次的 ETag / Last-Modified 與內容，用於條件式請求 {url: dict}
+        self._feed_cache: Dict[str, Dict] = {}
+        # 解析用的 process pool，首次收集時建立並於之後的收集沿用
+        self.parse_workers = parse_workers
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
     
     def load_sources_from_file(self, filepath: str) -> None:
         """從 JSON 檔案載入來源設定"""
@@ -157,18 +232,41 @@ class SecurityNewsCollector:
             print(f"   {url}")
         print("-" * 60)
     
-    def _generate_hash(self, content: str) -> str:
-        """產生內容雜湊值（用於去重）"""
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _hash_key(content: str) -> bytes:
+        """產生 8 bytes 的去重鍵（暖容器重複收集時可直接取用快取）"""
+        return hashlib.blake2b(content.encode('utf-8'), digest_size=8).digest()
+    
+    @staticmethod
+    def _generate_hash(content: str) -> str:
+        """產生內容雜湊值（輸出用的十六進位字串）"""
+        return SecurityNewsCollector._hash_key(content).hex()
     
     def _clean_html(self, html_content: str) -> str:
         """清理 HTML 標籤，保留純文字"""
         if not html_content:
             return ""
-        soup = BeautifulSoup(html_content, 'lxml')
-        text = soup.get_text(separator=' ', strip=True)
+        
+        # 純文字（無標籤、無實體）不需解析
+        if '<' not in html_content and '&' not in html_content:
+            return _WS_RE.sub(' ', html_content).strip()
+        
+        try:
+            root = lxml_html.fromstring(html_content.encode('utf-8'), parser=_HTML_PARSER)
+            # 只清空 script / style 的內容，後方文字仍是獨立片段，不會與前段黏在一起
+            for element in root.iter('script', 'style'):
+                element.text = None
+            # 各段文字以空白分隔，與 BeautifulSoup get_text(separator=' ', strip=True) 相同
+            text = ' '.join(t.strip() for t in root.itertext() if t.strip())
+        except etree.ParserError:
+            # 只有結束標籤等無內容的片段，lxml 視為空文件
+            text = ''
+        except ValueError:
+            text = html_content
+        
         # 移除多餘空白
-        text = re.sub(r'\s+', ' ', text)
+        text = _WS_RE.sub(' ', text)
         return text.strip()
     
     def _extract_summary(self, entry: dict, max_length: int = 300) -> str:
@@ -183,108 +281,279 @@ class SecurityNewsCollector:
         elif hasattr(entry, 'content') and entry.content:
             summary = entry.content[0].get('value', '')
         
-        # 清理 HTML
-        summary = self._clean_html(summary)
+        # 先截斷原始 HTML 再清理，長篇內文不必整份解析（保留足夠餘裕給標籤與空白）
+        raw_limit = max_length * 8
+        if len(summary) > raw_limit:
+            cleaned = self._clean_html(summary[:raw_limit])
+            # 前段多為標籤（如 <figure> 的 srcset）時，截斷後的文字可能不足，改清理完整內容
+            summary = cleaned if len(cleaned) > max_length else self._clean_html(summary)
+        else:
+            summary = self._clean_html(summary)
         
-        # 截斷到最大長度
+        # 截斷到最大長度（於最後一個空白處斷開）
         if len(summary) > max_length:
-            summary = summary[:max_length].rsplit(' ', 1)[0] + '...'
+            cut = summary[:max_length]
+            space = cut.rfind(' ')
+            if space != -1:
+                cut = cut[:space]
+            summary = cut + '...'
         
         return summary
     
-    def _parse_date(self, entry: dict) -> str:
-        """解析日期"""
+    def _parse_date(self, entry: dict) -> datetime:
+        """解析日期（精確到分鐘）"""
         try:
             if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                dt = datetime(*entry.published_parsed[:6])
-                return dt.strftime('%Y-%m-%d %H:%M')
+                return datetime(*entry.published_parsed[:5])
             elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                dt = datetime(*entry.updated_parsed[:6])
-                return dt.strftime('%Y-%m-%d %H:%M')
+                return datetime(*entry.updated_parsed[:5])
             elif hasattr(entry, 'published'):
-                return entry.published[:16]
+                return datetime.fromisoformat(entry.published[:16])
         except:
             pass
-        return datetime.now().strftime('%Y-%m-%d %H:%M')
+        return datetime.now().replace(second=0, microsecond=0)
+    
+    @classmethod
+    def _category_automaton(cls) -> 'ahocorasick.Automaton':
+        """分類關鍵字的 Aho-Corasick 自動機（首次使用時建立，同類別共用）"""
+        automaton = cls.__dict__.get('_CATEGORY_AUTOMATON')
+        if automaton is None:
+            automaton = ahocorasick.Automaton()
+            for priority, (category, keywords) in enumerate(cls.CATEGORY_KEYWORDS_LOWER.items()):
+                for keyword in keywords:
+                    # 同一關鍵字屬於多個分類時，保留排序在前的分類
+                    if keyword not in automaton:
+                        automaton.add_word(keyword, (priority, category))
+            automaton.make_automaton()
+            cls._CATEGORY_AUTOMATON = automaton
+        return automaton
     
     def _categorize(self, title: str, summary: str) -> str:
         """自動分類新聞"""
         content = (title + ' ' + summary).lower()
         
-        for category, keywords in self.CATEGORY_KEYWORDS.items():
-            for keyword in keywords:
-                if keyword.lower() in content:
-                    return category
+        # 單次掃描找出所有命中的關鍵字，依 CATEGORY_KEYWORDS 的順序取第一個分類
+        matches = [match for _, match in self._category_automaton().iter(content)]
+        if matches:
+            return min(matches)[1]
         
         return '其他/Other'
     
     def _extract_keywords(self, title: str, summary: str) -> List[str]:
         """擷取關鍵字"""
         content = title + ' ' + summary
+        content_lower = content.lower()
         keywords = []
         
         # 找 CVE 編號
-        cve_pattern = r'CVE-\d{4}-\d+'
-        cves = re.findall(cve_pattern, content, re.IGNORECASE)
+        cves = _CVE_RE.findall(content)
         keywords.extend([cve.upper() for cve in cves])
         
         # 找重要關鍵字
-        for kw in self.IMPORTANT_KEYWORDS:
-            if kw.lower() in content.lower() and kw not in keywords:
+        for kw, kw_lower in self.IMPORTANT_KEYWORDS_LOWER:
+            if kw_lower in content_lower and kw not in keywords:
                 keywords.append(kw)
         
         return keywords[:10]  # 最多 10 個關鍵字
     
-    def _fetch_feed(self, source_name: str, url: str) -> List[NewsItem]:
-        """抓取單一 RSS Feed"""
-        items = []
+    @staticmethod
+    def _parse_feed_fast(content: bytes) -> List[feedparser.FeedParserDict]:
+        """
+        以 lxml 直接解析 RSS 2.0 / Atom
+        
+        回傳與 feedparser entries 相同介面的項目；
+        無法辨識的格式回傳空串列、格式錯誤則拋出 XMLSyntaxError，
+        由呼叫端改用容錯較佳的 feedparser
+        """
+        parser = etree.XMLParser(resolve_entities=False)
+        root = etree.fromstring(content, parser=parser)
+        if root is None:
+            return []
+        
+        def text_of(element) -> str:
+            return ''.join(element.itertext()) if element is not None else ''
+        
+        entries = []
+        
+        # RSS 2.0
+        for item in root.iterfind('.//item'):
+            entry = feedparser.FeedParserDict()
+            entry['title'] = text_of(item.find('title'))
+            entry['link'] = text_of(item.find('link'))
+            if not entry['link'].strip():
+                # 與 feedparser 相同：沒有 <link> 時，以 isPermaLink 不為 false 的 guid 作為連結
+                guid = item.find('guid')
+                if guid is not None and guid.get('isPermaLink', 'true').strip().lower() != 'false':
+                    entry['link'] = text_of(guid)
+            encoded = item.find(_CONTENT_ENCODED)
+            if encoded is not None:
+                entry['content'] = [{'value': text_of(encoded)}]
+            description = item.find('description')
+            if description is not None:
+                entry['summary'] = text_of(description)
+            elif encoded is not None:
+                entry['summary'] = entry['content'][0]['value']
+            published = item.findtext('pubDate') or item.findtext(_DC_DATE)
+            if published:
+                entry['published'] = published
+                entry['published_parsed'] = _parse_feed_date(published)
+            entries.append(entry)
+        
+        # Atom
+        for item in root.iterfind(f'.//{_ATOM}entry'):
+            entry = feedparser.FeedParserDict()
+            entry['title'] = text_of(item.find(f'{_ATOM}title'))
+            entry['link'] = ''
+            for link in item.iterfind(f'{_ATOM}link'):
+                if link.get('rel', 'alternate') == 'alternate':
+                    entry['link'] = link.get('href', '')
+                    break
+            content_el = item.find(f'{_ATOM}content')
+            if content_el is not None:
+                entry['content'] = [{'value': text_of(content_el)}]
+            summary = item.find(f'{_ATOM}summary')
+            if summary is not None:
+                entry['summary'] = text_of(summary)
+            elif content_el is not None:
+                entry['summary'] = entry['content'][0]['value']
+            for key, tag in (('published', 'published'), ('updated', 'updated')):
+                value = item.findtext(f'{_ATOM}{tag}')
+                if value:
+                    entry[key] = value
+                    entry[key + '_parsed'] = _parse_feed_date(value)
+            entries.append(entry)
+        
+        return entries
+    
+    async def _download_feed(self, session: aiohttp.ClientSession, url: str) -> bytes:
+        """下載 Feed 內容（來源未更新時回 304，沿用上次內容）"""
+        headers = {}
+        cached = self._feed_cache.get(url)
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        async with session.get(url, headers=headers) as resp:
+            if resp.status == 304 and cached:
+                return cached['content']
+            content = await resp.read()
+            
+            etag = resp.headers.get('ETag')
+            last_modified = resp.headers.get('Last-Modified')
+            if resp.ok and (etag or last_modified):
+                self._feed_cache[url] = {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    'content': content
+                }
+        return content
+    
+    def _parse_items(self, source_name: str, content: bytes) -> List[NewsItem]:
+        """解析 Feed 內容為新聞項目"""
+        # 優先以 lxml 快速解析，格式無法辨識或解析失敗時改用 feedparser
         try:
-            feed = feedparser.parse(url)
+            entries = self._parse_feed_fast(content)
+        except etree.XMLSyntaxError:
+            entries = []
+        if not entries:
+            entries = feedparser.parse(content).entries
+        
+        items = []
+        for entry in entries[:20]:  # 每個來源最多 20 則
+            title = entry.get('title', '').strip()
+            link = entry.get('link', '').strip()
             
-            for entry in feed.entries[:20]:  # 每個來源最多 20 則
-                title = entry.get('title', '').strip()
-                link = entry.get('link', '').strip()
-                
-                if not title or not link:
-                    continue
-                
-                # 去重檢查
-                content_hash = self._generate_hash(title + link)
-                if content_hash in self.seen_hashes:
-                    continue
-                self.seen_hashes.add(content_hash)
-                
-                # 擷取資訊
-                summary = self._extract_summary(entry)
-                date = self._parse_date(entry)
-                category = self._categorize(title, summary)
-                keywords = self._extract_keywords(title, summary)
-                
-                item = NewsItem(
-                    title=title,
-                    link=link,
-                    date=date,
-                    summary=summary,
-                    source=source_name,
-                    category=category,
-                    keywords=keywords,
-                    content_hash=content_hash
-                )
-                items.append(item)
+            if not title or not link:
+                continue
+            
+            # 擷取資訊
+            summary = self._extract_summary(entry)
+            date = self._parse_date(entry)
+            category = self._categorize(title, summary)
+            keywords = self._extract_keywords(title, summary)
             
+            item = NewsItem(
+                title=title,
+                link=link,
+                date=date,
+                summary=summary,
+                source=source_name,
+                category=category,
+                keywords=keywords,
+                content_hash=self._generate_hash(title + link)
+            )
+            items.append(item)
+        
+        return items
+    
+    async def _parse_items_async(self, source_name: str, content: bytes) -> List[NewsItem]:
+        """解析 Feed 內容；有 process pool 時交給子行程，避免 CPU 密集的解析卡住事件迴圈"""
+        pool = self._parse_pool
+        if pool is not None:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(
+                    pool, _parse_items_in_worker, type(self), source_name, content
+                )
+            except BrokenProcessPool:
+                # 子行程已失效，捨棄後下次收集重新建立，這次改在本行程解析
+                self._parse_pool = None
+            except (pickle.PicklingError, AttributeError):
+                # 參數無法 pickle 時改在本行程解析
+                pass
+        return self._parse_items(source_name, content)
+    
+    def _ensure_parse_pool(self) -> None:
+        """依 parse_workers 建立解析用的 process pool（未開啟或環境不支援時維持本行程解析）"""
+        if self._parse_pool is not None or self.parse_workers < 2:
+            return
+        
+        # 子行程以類別的匯入路徑找回收集器，定義在函式內等無法 pickle 的子類別只能在本行程解析
+        try:
+            pickle.dumps(type(self))
+        except (pickle.PicklingError, AttributeError):
+            return
+        
+        # 呼叫端可能已有其他執行緒（aiohttp 的 DNS 解析、API 的背景更新），
+        # fork 整個行程有死結風險，改由 forkserver（不支援時用 spawn）產生子行程
+        start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        try:
+            self._parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers,
+                mp_context=multiprocessing.get_context(start_method)
+            )
+        except (OSError, NotImplementedError):
+            # 部分 serverless 環境沒有 /dev/shm，無法建立行程間的同步物件
+            pass
+    
+    def close(self) -> None:
+        """關閉解析用的 process pool"""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown()
+            self._parse_pool = None
+    
+    async def _fetch_feed(self, session: aiohttp.ClientSession,
+                          source_name: str, url: str) -> List[NewsItem]:
+        """抓取單一 RSS Feed"""
+        items = []
+        try:
+            content = await self._download_feed(session, url)
+            items = await self._parse_items_async(source_name, content)
             print(f"✅ {source_name}: {len(items)} 則新聞")
             
         except Exception as e:
-            print(f"❌ {source_name}: 抓取失敗 - {str(e)[:50]}")
+            print(f"❌ {source_name}: 抓取失敗 - {str(e)[:50] or type(e).__name__}")
         
         return items
     
-    def collect(self, max_workers: int = 5) -> pd.DataFrame:
+    async def acollect(self, max_workers: int = 50) -> pd.DataFrame:
         """
-        收集所有來源的新聞
+        收集所有來源的新聞（非同步版本）
         
         Args:
-            max_workers: 並行抓取的最大執行緒數
+            max_workers: 同時連線數上限
             
         Returns:
             包含所有新聞的 DataFrame
@@ -295,28 +564,78 @@ class SecurityNewsCollector:
         self.news_items = []
         self.seen_hashes = set()
         
-        # 並行抓取
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {
-                executor.submit(self._fetch_feed, name, url): name 
-                for name, url in self.sources.items()
-            }
-            
-            for future in as_completed(futures):
-                items = future.result()
-                self.news_items.extend(items)
+        # 已移除來源的 Feed 內容不再保留
+        active_urls = set(self.sources.values())
+        self._feed_cache = {url: cached for url, cached in self._feed_cache.items() if url in active_urls}
+        
+        # 單一執行緒同時抓取所有來源，總耗時約等於最慢的來源；
+        # 開啟 parse_workers 時解析分散到多個行程，不受 GIL 限制
+        self._ensure_parse_pool()
+        connector = aiohttp.TCPConnector(limit=max_workers)
+        timeout = aiohttp.ClientTimeout(total=10, connect=5)
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={'User-Agent': feedparser.USER_AGENT}
+        ) as session:
+            results = await asyncio.gather(
+                *[self._fetch_feed(session, name, url) for name, url in self.sources.items()],
+                return_exceptions=True
+            )
+        
+        merged = []
+        for items in results:
+            if isinstance(items, list):
+                merged.extend(items)
+        self.news_items = self._dedup(merged)
         
         print("-" * 50)
         print(f"📊 共收集 {len(self.news_items)} 則不重複新聞")
         
-        # 轉換為 DataFrame
+        return self._build_df()
+    
+    def _dedup(self, items: List[NewsItem]) -> List[NewsItem]:
+        """合併後單次去重：依日期由新到舊，同一則新聞只保留第一筆"""
+        unique_items = []
+        for item in sorted(items, key=lambda i: i.date, reverse=True):
+            if item.content_hash not in self.seen_hashes:
+                self.seen_hashes.add(item.content_hash)
+                unique_items.append(item)
+        return unique_items
+    
+    def collect(self, max_workers: int = 50) -> pd.DataFrame:
+        """
+        收集所有來源的新聞
+        
+        已在事件迴圈中執行時請改用 await acollect()
+        
+        Args:
+            max_workers: 同時連線數上限
+            
+        Returns:
+            包含所有新聞的 DataFrame
+        """
+        return asyncio.run(self.acollect(max_workers))
+    
+    def _build_df(self) -> pd.DataFrame:
+        """由 news_items 建立依日期排序的 DataFrame"""
         if self.news_items:
-            self.df = pd.DataFrame([asdict(item) for item in self.news_items])
-            self.df['keywords_str'] = self.df['keywords'].apply(
-                lambda x: ', '.join(x) if x else ''
-            )
-            # 依日期排序
-            self.df = self.df.sort_values('date', ascending=False).reset_index(drop=True)
+            # 直接以欄位陣列建立，省去逐筆 asdict 與逐列型別推斷
+            items = self.news_items
+            self.df = pd.DataFrame({
+                'title': [i.title for i in items],
+                'link': [i.link for i in items],
+                'date': [i.date for i in items],
+                'summary': [i.summary for i in items],
+                # 來源與分類種類少，以 category 型別儲存
+                'source': pd.Categorical([i.source for i in items]),
+                'category': pd.Categorical([i.category for i in items]),
+                'keywords': [i.keywords for i in items],
+                'content_hash': [i.content_hash for i in items],
+                'keywords_str': [', '.join(i.keywords) for i in items],
+            })
+            # 依日期排序（datetime64 欄位；stable 讓同時間的新聞維持收集順序）
+            self.df = self.df.sort_values('date', ascending=False, kind='stable').reset_index(drop=True)
         else:
             self.df = pd.DataFrame()
         
@@ -335,20 +654,27 @@ class SecurityNewsCollector:
         if self.df is None or self.df.empty:
             return pd.DataFrame()
         
-        query_lower = query.lower()
-        mask = (
-            self.df['title'].str.lower().str.contains(query_lower, na=False) |
-            self.df['summary'].str.lower().str.contains(query_lower, na=False) |
-            self.df['keywords_str'].str.lower().str.contains(query_lower, na=False)
-        )
+        mask = self._search_haystack().str.contains(query.lower(), regex=False, na=False)
         return self.df[mask].reset_index(drop=True)
     
+    def _search_haystack(self) -> pd.Series:
+        """標題、摘要、關鍵字合併後轉小寫（self.df 未變動時重複使用）"""
+        if self._haystack_df is not self.df:
+            # 以換行分隔，避免查詢字串跨欄位誤判
+            self._haystack = (
+                self.df['title'].fillna('') + '\n' +
+                self.df['summary'].fillna('') + '\n' +
+                self.df['keywords_str'].fillna('')
+            ).str.lower()
+            self._haystack_df = self.df
+        return self._haystack
+    
     def filter_by_category(self, category: str) -> pd.DataFrame:
         """依分類篩選"""
         if self.df is None or self.df.empty:
             return pd.DataFrame()
         
-        mask = self.df['category'].str.contains(category, case=False, na=False)
+        mask = self.df['category'].str.contains(category, case=False, regex=False, na=False)
         return self.df[mask].reset_index(drop=True)
     
     def filter_by_source(self, source: str) -> pd.DataFrame:
@@ -356,22 +682,20 @@ class SecurityNewsCollector:
         if self.df is None or self.df.empty:
             return pd.DataFrame()
         
-        mask = self.df['source'].str.contains(source, case=False, na=False)
+        mask = self.df['source'].str.contains(source, case=False, regex=False, na=False)
         return self.df[mask].reset_index(drop=True)
     
-    def filter_by_date(self, start_date: str = None, end_date: str = None) -> pd.DataFrame:
-        """依日期範圍篩選"""
+    def filter_by_date(self, start_date: Union[str, datetime] = None,
+                       end_date: Union[str, datetime] = None) -> pd.DataFrame:
+        """依日期範圍篩選（接受日期字串或 datetime / Timestamp）"""
         if self.df is None or self.df.empty:
             return pd.DataFrame()
         
-        result = self.df.copy()
-        
-        if start_date:
-            result = result[result['date'] >= start_date]
-        if end_date:
-            result = result[result['date'] <= end_date]
+        dates = self.df['date']
+        start = pd.to_datetime(start_date) if start_date else dates.min()
+        end = pd.to_datetime(end_date) if end_date else dates.max()
         
-        return result.reset_index(drop=True)
+        return self.df[dates.between(start, end)].reset_index(drop=True)
     
     def get_summary_stats(self) -> Dict:
         """取得統計摘要"""
@@ -383,8 +707,8 @@ class SecurityNewsCollector:
             'sources': self.df['source'].value_counts().to_dict(),
             'categories': self.df['category'].value_counts().to_dict(),
             'date_range': {
-                'earliest': self.df['date'].min(),
-                'latest': self.df['date'].max()
+                'earliest': self.df['date'].min().strftime(DATE_FORMAT),
+                'latest': self.df['date'].max().strftime(DATE_FORMAT)
             }
         }
     
@@ -400,25 +724,12 @@ class SecurityNewsCollector:
             return
         
         from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-        from openpyxl.utils.dataframe import dataframe_to_rows
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
+        from openpyxl.styles.fonts import DEFAULT_FONT
         
-        wb = Workbook()
-        
-        # ===== 工作表 1: 新聞清單 =====
-        ws1 = wb.active
-        ws1.title = "資安新聞"
-        
-        # 標題列
-        headers = ['序號', '日期', '來源', '分類', '標題', '摘要', '關鍵字', '連結']
-        header_fill = PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid")
-        header_font = Font(color="FFFFFF", bold=True, size=11)
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws1.cell(row=1, column=col, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+        # 唯寫模式：逐列寫出，不在記憶體中保留整份工作表
+        wb = Workbook(write_only=True)
         
         # 分類顏色
         category_colors = {
@@ -433,45 +744,58 @@ class SecurityNewsCollector:
             '政策法規': 'ECEFF1',
         }
         
-        # 資料列
+        # 樣式只註冊一次，儲存格以名稱引用
         thin_border = Border(
             left=Side(style='thin', color='CCCCCC'),
             right=Side(style='thin', color='CCCCCC'),
             top=Side(style='thin', color='CCCCCC'),
             bottom=Side(style='thin', color='CCCCCC')
         )
+        cell_alignment = Alignment(wrap_text=True, vertical='top')
         
-        for idx, row in self.df.iterrows():
-            row_num = idx + 2
-            
-            ws1.cell(row=row_num, column=1, value=idx + 1)
-            ws1.cell(row=row_num, column=2, value=row['date'])
-            ws1.cell(row=row_num, column=3, value=row['source'])
-            
-            # 分類（帶顏色）
-            cat_cell = ws1.cell(row=row_num, column=4, value=row['category'])
-            for cat_key, color in category_colors.items():
-                if cat_key in row['category']:
-                    cat_cell.fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
-                    break
-            
-            ws1.cell(row=row_num, column=5, value=row['title'])
-            ws1.cell(row=row_num, column=6, value=row['summary'])
-            ws1.cell(row=row_num, column=7, value=row['keywords_str'])
-            
-            # 連結
-            link_cell = ws1.cell(row=row_num, column=8, value=row['link'])
-            link_cell.hyperlink = row['link']
-            link_cell.font = Font(color="0563C1", underline="single")
-            
-            # 套用框線
-            for col in range(1, 9):
-                ws1.cell(row=row_num, column=col).border = thin_border
-                ws1.cell(row=row_num, column=col).alignment = Alignment(
-                    wrap_text=True, vertical='top'
-                )
+        def add_style(name: str, **attrs) -> str:
+            style = NamedStyle(name=name, font=DEFAULT_FONT)
+            for attr, value in attrs.items():
+                setattr(style, attr, value)
+            wb.add_named_style(style)
+            return name
+        
+        header_style = add_style(
+            'news_header',
+            fill=PatternFill(start_color="1F4E79", end_color="1F4E79", fill_type="solid"),
+            font=Font(color="FFFFFF", bold=True, size=11),
+            alignment=Alignment(horizontal='center', vertical='center')
+        )
+        body_style = add_style('news_body', border=thin_border, alignment=cell_alignment)
+        link_style = add_style(
+            'news_link',
+            border=thin_border,
+            alignment=cell_alignment,
+            font=Font(color="0563C1", underline="single")
+        )
+        category_styles = {
+            cat_key: add_style(
+                f'news_category_{cat_key}',
+                border=thin_border,
+                alignment=cell_alignment,
+                fill=PatternFill(start_color=color, end_color=color, fill_type="solid")
+            )
+            for cat_key, color in category_colors.items()
+        }
+        title_style = add_style('stats_title', font=Font(bold=True, size=14))
+        heading_style = add_style('stats_heading', font=Font(bold=True))
+        
+        def styled(ws, value, style: str, hyperlink: str = None) -> WriteOnlyCell:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            if hyperlink:
+                cell.hyperlink = hyperlink
+            return cell
         
-        # 調整欄寬
+        # ===== 工作表 1: 新聞清單 =====
+        ws1 = wb.create_sheet(title="資安新聞")
+        
+        # 欄寬與凍結首列須在寫入資料前設定
         ws1.column_dimensions['A'].width = 6
         ws1.column_dimensions['B'].width = 16
         ws1.column_dimensions['C'].width = 18
@@ -480,51 +804,59 @@ class SecurityNewsCollector:
         ws1.column_dimensions['F'].width = 60
         ws1.column_dimensions['G'].width = 30
         ws1.column_dimensions['H'].width = 40
-        
-        # 凍結首列
         ws1.freeze_panes = 'A2'
         
+        # 標題列
+        headers = ['序號', '日期', '來源', '分類', '標題', '摘要', '關鍵字', '連結']
+        ws1.append([styled(ws1, header, header_style) for header in headers])
+        
+        # 資料列
+        columns = ['date', 'source', 'category', 'title', 'summary', 'keywords_str', 'link']
+        rows = self.df[columns].itertuples(index=False, name=None)
+        for idx, (date, source, category, title, summary, keywords_str, link) in enumerate(rows, 1):
+            # 分類（帶顏色）：以「中文/English」的中文前綴查表
+            category_style = category_styles.get(category.split('/', 1)[0], body_style)
+            
+            ws1.append([
+                styled(ws1, idx, body_style),
+                styled(ws1, date.strftime(DATE_FORMAT), body_style),
+                styled(ws1, source, body_style),
+                styled(ws1, category, category_style),
+                styled(ws1, title, body_style),
+                styled(ws1, summary, body_style),
+                styled(ws1, keywords_str, body_style),
+                styled(ws1, link, link_style, hyperlink=link),
+            ])
+        
         # ===== 工作表 2: 統計分析 =====
         ws2 = wb.create_sheet(title="統計分析")
+        ws2.column_dimensions['A'].width = 25
+        ws2.column_dimensions['B'].width = 15
         
         stats = self.get_summary_stats()
         
         # 標題
-        ws2.cell(row=1, column=1, value="📊 資安新聞統計報告")
-        ws2.cell(row=1, column=1).font = Font(bold=True, size=14)
-        ws2.merge_cells('A1:C1')
+        ws2.append([styled(ws2, "📊 資安新聞統計報告", title_style)])
+        ws2.merged_cells.add('A1:C1')
+        ws2.append([])
         
         # 總覽
-        ws2.cell(row=3, column=1, value="總覽")
-        ws2.cell(row=3, column=1).font = Font(bold=True)
-        ws2.cell(row=4, column=1, value="新聞總數")
-        ws2.cell(row=4, column=2, value=stats.get('total_news', 0))
-        ws2.cell(row=5, column=1, value="最早日期")
-        ws2.cell(row=5, column=2, value=stats.get('date_range', {}).get('earliest', ''))
-        ws2.cell(row=6, column=1, value="最新日期")
-        ws2.cell(row=6, column=2, value=stats.get('date_range', {}).get('latest', ''))
+        ws2.append([styled(ws2, "總覽", heading_style)])
+        ws2.append(["新聞總數", stats.get('total_news', 0)])
+        ws2.append(["最早日期", stats.get('date_range', {}).get('earliest', '')])
+        ws2.append(["最新日期", stats.get('date_range', {}).get('latest', '')])
+        ws2.append([])
         
         # 來源統計
-        ws2.cell(row=8, column=1, value="來源分布")
-        ws2.cell(row=8, column=1).font = Font(bold=True)
-        row_num = 9
+        ws2.append([styled(ws2, "來源分布", heading_style)])
         for source, count in stats.get('sources', {}).items():
-            ws2.cell(row=row_num, column=1, value=source)
-            ws2.cell(row=row_num, column=2, value=count)
-            row_num += 1
+            ws2.append([source, count])
+        ws2.append([])
         
         # 分類統計
-        row_num += 1
-        ws2.cell(row=row_num, column=1, value="分類分布")
-        ws2.cell(row=row_num, column=1).font = Font(bold=True)
-        row_num += 1
+        ws2.append([styled(ws2, "分類分布", heading_style)])
         for category, count in stats.get('categories', {}).items():
-            ws2.cell(row=row_num, column=1, value=category)
-            ws2.cell(row=row_num, column=2, value=count)
-            row_num += 1
-        
-        ws2.column_dimensions['A'].width = 25
-        ws2.column_dimensions['B'].width = 15
+            ws2.append([category, count])
         
         # 儲存
         wb.save(filepath)
@@ -536,30 +868,43 @@ class SecurityNewsCollector:
             print("⚠️ 沒有資料可匯出")
             return
         
-        export_df = self.df[['date', 'source', 'category', 'title', 'summary', 'keywords_str', 'link']]
+        export_df = self.df[['date', 'source', 'category', 'title', 'summary', 'keywords_str', 'link']].assign(
+            date=self.df['date'].dt.strftime(DATE_FORMAT)
+        )
         export_df.to_csv(filepath, index=False, encoding='utf-8-sig')
         print(f"💾 已匯出至 {filepath}")
     
     def to_json(self, filepath: str = 'security_news.json') -> None:
         """匯出 JSON"""
-        if self.df is None or self.df.empty:
+        if not self.news_items:
             print("⚠️ 沒有資料可匯出")
             return
         
+        # 直接序列化 news_items（orjson 原生支援 dataclass），不經 DataFrame 轉換
+        items = sorted(self.news_items, key=lambda i: i.date, reverse=True)
         data = {
             'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'total_count': len(self.df),
-            'sources': list(self.df['source'].unique()),
-            'categories': list(self.df['category'].unique()),
-            'news': self.df.to_dict(orient='records')
+            'total_count': len(items),
+            'sources': list(dict.fromkeys(i.source for i in items)),
+            'categories': list(dict.fromkeys(i.category for i in items)),
+            'news': items
         }
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(
+                data,
+                default=json_default,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+            ))
         
         print(f"💾 已匯出至 {filepath}")
 
 
+def _parse_items_in_worker(collector_cls: type, source_name: str, content: bytes) -> List[NewsItem]:
+    """process pool 的解析入口（解析只用到類別層級設定，不需經過 __init__ 載入來源）"""
+    return collector_cls.__new__(collector_cls)._parse_items(source_name, content)
+
+
 def load_demo_data() -> List[Dict]:
     """載入展示資料（當無法連線時使用）"""
     return [
@@ -691,7 +1036,7 @@ if __name__ == '__main__':
             news_item = NewsItem(
                 title=item['title'],
                 link=item['link'],
-                date=item['date'],
+                date=datetime.strptime(item['date'], DATE_FORMAT),
                 summary=item['summary'],
                 source=item['source'],
                 category=item['category'],
@@ -700,11 +1045,7 @@ if __name__ == '__main__':
             )
             collector.news_items.append(news_item)
         
-        collector.df = pd.DataFrame([asdict(item) for item in collector.news_items])
-        collector.df['keywords_str'] = collector.df['keywords'].apply(
-            lambda x: ', '.join(x) if x else ''
-        )
-        collector.df = collector.df.sort_values('date', ascending=False).reset_index(drop=True)
+        collector._build_df()
         print(f"📊 已載入 {len(collector.df)} 則展示新聞")
     
     # 匯出檔案
@@ -0,0 +1,23 @@
+"""
+資安新聞來源設定
+================
+預設的 RSS 來源清單。不依賴任何第三方套件，
+API 只需要來源清單時可直接匯入，不必載入 news_collector。
+"""
+
+# 預設新聞來源
+DEFAULT_SOURCES = {
+    # 台灣來源
+    'iThome 資安': 'https://www.ithome.com.tw/rss/security',
+    'TWCERT/CC': 'https://www.twcert.org.tw/rss',
+    
+    # 國際來源
+    'The Hacker News': 'https://feeds.feedburner.com/TheHackersNews',
+    'Krebs on Security': 'https://krebsonsecurity.com/feed/',
+    'BleepingComputer': 'https://www.bleepingcomputer.com/feed/',
+    'Dark Reading': 'https://www.darkreading.com/rss.xml',
+    'SecurityWeek': 'https://feeds.feedburner.com/securityweek',
+    'Threatpost': 'https://threatpost.com/feed/',
+    'HackRead': 'https://www.hackread.com/feed/',
+    'Sophos News': 'https://news.sophos.com/en-us/feed/',
+}